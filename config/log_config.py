@@ -6,17 +6,21 @@ compatibles con desarrollo y PyInstaller.
 Maneja la distinción entre rutas de LECTURA (código, recursos internos)
 y rutas de ESCRITURA (logs, datos generados, config externa como credenciales).
 """
+import atexit
+import functools
 import logging
 import os
+import queue
 import sys
-import inspect # Necesario para fallbacks de ruta
-from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 # ---------------------------------------------------------------------------
 # Estado Interno del Logging
 # ---------------------------------------------------------------------------
 _configuracion_realizada = False
 _ruta_archivo_log_actual = None
+_listener_archivo = None # QueueListener que escribe el log de archivo en segundo plano
 
 # ---------------------------------------------------------------------------
 # Detección de Entorno Empaquetado (PyInstaller)
@@ -27,25 +31,40 @@ IS_BUNDLED = getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS')
 # Cálculo Centralizado de Rutas Base
 # ---------------------------------------------------------------------------
 
-def _obtener_ruta_base_lectura():
-    """
-    Retorna la ruta base absoluta para LEER archivos/código.
-    - En modo empaquetado: Retorna la carpeta temporal _MEIPASS.
-    - En modo desarrollo: Retorna la raíz del proyecto detectada.
-    """
-    if IS_BUNDLED:
-        # Los archivos empaquetados se leen desde _MEIPASS
-        ruta_base = sys._MEIPASS
-    else:
-        # En desarrollo, encontrar la raíz del proyecto
-        ruta_base = None
+# La implementación se elige UNA vez al importar según el entorno, de modo que
+# las funciones de rutas no vuelven a evaluar IS_BUNDLED en cada llamada.
+# Las rutas en sí se siguen calculando de forma perezosa (primer uso).
+if IS_BUNDLED:
+    @functools.lru_cache(maxsize=1)
+    def _obtener_ruta_base_lectura():
+        """
+        Retorna la ruta base absoluta para LEER archivos/código:
+        la carpeta temporal _MEIPASS, de donde se leen los archivos empaquetados.
+        """
+        return sys._MEIPASS
+
+    @functools.lru_cache(maxsize=1)
+    def _obtener_ruta_base_escritura():
+        """
+        Retorna la ruta base absoluta para ESCRIBIR archivos (logs, datos)
+        y LEER configuraciones externas (credenciales): el directorio del .EXE.
+        """
+        return os.path.dirname(sys.executable)
+
+else:
+    @functools.lru_cache(maxsize=1)
+    def _obtener_ruta_base_lectura():
+        """
+        Retorna la ruta base absoluta para LEER archivos/código:
+        la raíz del proyecto detectada.
+        """
         try:
-            # Intenta usar __file__ (asumiendo que está en config/)
-            directorio_actual = os.path.dirname(os.path.abspath(__file__))
-            # Sube un nivel para llegar a la raíz del proyecto desde config/
-            ruta_base = os.path.abspath(os.path.join(directorio_actual, '..'))
+            # En desarrollo: este módulo vive en config/, la raíz está un nivel arriba
+            return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         except NameError:
-            # Fallback si __file__ no está definido (ej. interactivo, zipapp)
+            # Fallback si __file__ no está definido (ej. interactivo, zipapp).
+            # 'inspect' se importa solo aquí para no cargarlo en el caso normal.
+            import inspect
             try:
                 # Intenta usar la pila de llamadas para encontrar el script original
                 caller_frame = inspect.currentframe()
@@ -53,77 +72,64 @@ def _obtener_ruta_base_lectura():
                 # (Evita quedarse en frames internos de librerías si es posible)
                 while caller_frame and caller_frame.f_back and '__file__' not in caller_frame.f_globals:
                     caller_frame = caller_frame.f_back
-                
+
                 # Si encontramos un frame adecuado con __file__
                 if caller_frame and '__file__' in caller_frame.f_globals:
-                     caller_file = caller_frame.f_globals['__file__']
+                    caller_file = caller_frame.f_globals['__file__']
                 # O intenta directamente con inspect.getfile en un frame anterior
-                else: 
-                     caller_frame_fallback = inspect.currentframe().f_back if inspect.currentframe().f_back else inspect.currentframe()
-                     caller_file = inspect.getfile(caller_frame_fallback)
-                
+                else:
+                    caller_frame_fallback = inspect.currentframe().f_back if inspect.currentframe().f_back else inspect.currentframe()
+                    caller_file = inspect.getfile(caller_frame_fallback)
+
                 directorio_script_original = os.path.dirname(os.path.abspath(caller_file))
-                
+
                 # Heurística: Si el script original está en 'scripts', sube un nivel
                 if os.path.basename(directorio_script_original) == 'scripts':
-                    ruta_base = os.path.abspath(os.path.join(directorio_script_original, '..'))
-                else:
-                    # Asume que el script original está en la raíz o la detección falló
-                    ruta_base = directorio_script_original
+                    return os.path.dirname(directorio_script_original)
+                # Asume que el script original está en la raíz o la detección falló
+                return directorio_script_original
             except Exception:
-                 # Fallback definitivo: Usa el directorio de trabajo actual
-                 ruta_base = os.path.abspath('.')
-                 # print(f"ADVERTENCIA (log_config): No se pudo determinar la raíz del proyecto, usando CWD ({ruta_base}) como base de lectura.") # Opcional
-        
-        # Si la ruta base sigue sin definirse por alguna razón
-        if ruta_base is None:
-             ruta_base = os.path.abspath('.')
-             print(f"ERROR (log_config): Fallback final a CWD ({ruta_base}) como base de lectura.")
-
-    return ruta_base
-
-def _obtener_ruta_base_escritura():
-    """
-    Retorna la ruta base absoluta para ESCRIBIR archivos (logs, datos)
-    y LEER configuraciones externas (credenciales).
-    - En modo empaquetado: Retorna el directorio donde está el .EXE.
-    - En modo desarrollo: Retorna la raíz del proyecto (igual que lectura).
-    """
-    if IS_BUNDLED:
-        # Escribir/leer archivos externos junto al ejecutable
-        return os.path.dirname(sys.executable)
-    else:
-        # En desarrollo, usar la misma raíz del proyecto para escribir/leer
-        return _obtener_ruta_base_lectura()
+                # Fallback definitivo: Usa el directorio de trabajo actual
+                return os.path.abspath('.')
+
+    # En desarrollo se usa la misma raíz del proyecto para escribir/leer
+    _obtener_ruta_base_escritura = _obtener_ruta_base_lectura
 
 # --- Rutas Base Calculadas (disponibles para importar en otros módulos) ---
-RUTA_BASE_LECTURA = _obtener_ruta_base_lectura()
-RUTA_BASE_ESCRITURA = _obtener_ruta_base_escritura()
+# Se calculan de forma perezosa en el primer acceso (PEP 562), evitando el
+# recorrido de la pila y las llamadas al sistema de archivos al importar.
+def __getattr__(name):
+    if name == "RUTA_BASE_LECTURA":
+        return _obtener_ruta_base_lectura()
+    if name == "RUTA_BASE_ESCRITURA":
+        return _obtener_ruta_base_escritura()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+@functools.lru_cache(maxsize=1)
+def _ruta_base_escritura_path():
+    """Ruta base de escritura como objeto Path (calculada una sola vez)."""
+    return Path(_obtener_ruta_base_escritura())
 
 # ---------------------------------------------------------------------------
 # Funciones Públicas para Obtener Rutas Específicas
 # ---------------------------------------------------------------------------
 
+@functools.cache
 def get_credentials_path():
     """
     Obtiene la ruta absoluta al archivo 'credenciales.json' EXTERNO.
 
     - En desarrollo: Busca en {RaízProyecto}/config/credenciales.json
     - Empaquetado: Busca en {DirectorioDelEXE}/config/credenciales.json
-    """
-    if IS_BUNDLED:
-        # Para credenciales externas, la base es el directorio del EXE
-        base_para_credenciales = RUTA_BASE_ESCRITURA
-    else:
-        # En desarrollo, la base es la raíz del proyecto
-        base_para_credenciales = RUTA_BASE_LECTURA
 
-    # Construir la ruta relativa a la base adecuada
-    ruta_final = os.path.join(base_para_credenciales, 'config', 'credenciales.json')
-    # print(f"DEBUG (get_credentials_path): IS_BUNDLED={IS_BUNDLED}, Base={base_para_credenciales}, Final={ruta_final}") # Descomentar para depuración intensa
-    return ruta_final
+    En ambos casos es la ruta base de escritura (en desarrollo coincide con la raíz).
+    """
+    ruta_final = _ruta_base_escritura_path() / 'config' / 'credenciales.json'
+    # print(f"DEBUG (get_credentials_path): IS_BUNDLED={IS_BUNDLED}, Final={ruta_final}") # Descomentar para depuración intensa
+    return os.fspath(ruta_final)
 
 
+@functools.cache
 def get_data_path(relative_path_inside_data=""):
     """
     Obtiene la ruta absoluta a un archivo/subdirectorio dentro de la carpeta 'data'.
@@ -131,16 +137,82 @@ def get_data_path(relative_path_inside_data=""):
     (junto al .exe o en la raíz del proyecto).
     """
     # Datos siempre en la ubicación de escritura
-    return os.path.join(RUTA_BASE_ESCRITURA, 'data', relative_path_inside_data)
+    ruta = _ruta_base_escritura_path() / 'data'
+    if relative_path_inside_data:
+        ruta = ruta / relative_path_inside_data
+    return os.fspath(ruta)
+
+def _ruta_directorio_logs():
+    """Ruta de la carpeta 'logs' como Path, sin tocar el sistema de archivos."""
+    return _ruta_base_escritura_path() / 'logs'
 
+@functools.lru_cache(maxsize=1)
+def _directorio_logs():
+    """
+    Ruta de la carpeta 'logs' como Path, creándola en el primer uso.
+    Se ejecuta una sola vez por proceso (un fallo de makedirs no se cachea).
+    """
+    directorio = _ruta_directorio_logs()
+    os.makedirs(directorio, exist_ok=True)
+    return directorio
+
+@functools.cache
 def get_logs_path(relative_path_inside_logs=""):
     """
     Obtiene la ruta absoluta a un archivo/subdirectorio dentro de la carpeta 'logs'.
     La carpeta 'logs' SIEMPRE se considera relativa a la RUTA_BASE_ESCRITURA
-    (junto al .exe o en la raíz del proyecto).
+    (junto al .exe o en la raíz del proyecto). La carpeta se crea si no existe.
     """
     # Logs siempre en la ubicación de escritura
-    return os.path.join(RUTA_BASE_ESCRITURA, 'logs', relative_path_inside_logs)
+    ruta = _directorio_logs()
+    if relative_path_inside_logs:
+        ruta = ruta / relative_path_inside_logs
+    return os.fspath(ruta)
+
+
+# ---------------------------------------------------------------------------
+# Ubicación [archivo:línea] Solo para Avisos
+# ---------------------------------------------------------------------------
+# Obtener archivo/línea obliga a logging a inspeccionar la pila en CADA registro.
+# Se desactiva esa búsqueda global (logging._srcfile = None) y se recupera la
+# ubicación solo para WARNING o superior, donde realmente aporta al diagnóstico.
+
+# Se toma de un code object (como hace logging._srcfile) y no de logging.__file__,
+# porque los frames exponen co_filename, que puede diferir (PyInstaller, .pyc sin fuente).
+_DIRECTORIO_LOGGING = os.path.dirname(os.path.normcase(logging.Filter.filter.__code__.co_filename))
+
+class _FiltroUbicacionEnAvisos(logging.Filter):
+    """
+    Completa pathname/filename/lineno/funcName de los registros WARNING o
+    superiores, recorriendo la pila hasta el primer frame fuera de 'logging'.
+    Debe ir en handlers que se ejecuten en el hilo que loguea.
+    """
+    def filter(self, record):
+        if record.levelno >= logging.WARNING and not record.lineno:
+            frame = sys._getframe(1)
+            while frame and os.path.dirname(os.path.normcase(frame.f_code.co_filename)) == _DIRECTORIO_LOGGING:
+                frame = frame.f_back
+            if frame:
+                record.pathname = frame.f_code.co_filename
+                record.filename = os.path.basename(record.pathname)
+                record.module = os.path.splitext(record.filename)[0]
+                record.lineno = frame.f_lineno
+                record.funcName = frame.f_code.co_name
+        return True
+
+class _FormateadorUbicacionEnAvisos(logging.Formatter):
+    """
+    Usa 'formato_avisos' (con [archivo:línea]) para WARNING o superior y el
+    formato base para el resto de niveles.
+    """
+    def __init__(self, formato, formato_avisos, datefmt=None):
+        super().__init__(formato, datefmt=datefmt)
+        self._formateador_avisos = logging.Formatter(formato_avisos, datefmt=datefmt)
+
+    def format(self, record):
+        if record.levelno >= logging.WARNING:
+            return self._formateador_avisos.format(record)
+        return super().format(record)
 
 
 # ---------------------------------------------------------------------------
@@ -155,7 +227,8 @@ def configurar_logging(
     max_bytes_rotacion=10*1024*1024, # 10 MB
     num_respaldos=5,
     log_a_consola=True,
-    log_a_archivo=True
+    log_a_archivo=True,
+    loggers_directos=()
 ):
     """
     Configura el sistema de logging usando las rutas de escritura centralizadas.
@@ -170,8 +243,13 @@ def configurar_logging(
         num_respaldos (int): Número de archivos de respaldo a mantener.
         log_a_consola (bool): Habilitar logging en consola.
         log_a_archivo (bool): Habilitar logging en archivo.
+        loggers_directos (tuple[str]): Nombres de loggers que reciben los handlers
+            directamente (propagate=False) en vez de propagar al raíz. Su nivel se
+            ajusta al mínimo de los handlers, así los niveles que ningún handler
+            emitiría se descartan en isEnabledFor sin crear el registro.
+            "ConfigLog" siempre se incluye.
     """
-    global _configuracion_realizada, _ruta_archivo_log_actual
+    global _configuracion_realizada, _ruta_archivo_log_actual, _listener_archivo
 
     # --- Seguridad: Evitar Reconfiguración Múltiple ---
     if _configuracion_realizada:
@@ -182,8 +260,17 @@ def configurar_logging(
     # --- Configuración Raíz y Formato ---
     logger_raiz = logging.getLogger() # Logger raíz
     logger_raiz.setLevel(logging.DEBUG) # Permitir que pasen todos los mensajes, handlers filtran
-    formato_log_str = '%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s'
-    formateador_log = logging.Formatter(formato_log_str, datefmt='%Y-%m-%d %H:%M:%S')
+    formato_log_str = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    formato_avisos_str = '%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s'
+    formateador_log = _FormateadorUbicacionEnAvisos(formato_log_str, formato_avisos_str, datefmt='%Y-%m-%d %H:%M:%S')
+    filtro_ubicacion = _FiltroUbicacionEnAvisos()
+
+    # Sin búsqueda de archivo/línea por registro (la recupera el filtro para avisos)
+    # ni datos de hilo/proceso, que el formato no utiliza.
+    logging._srcfile = None
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
 
     # --- Limpieza de Handlers Existentes ---
     # Esencial para prevenir logs duplicados si hay reimports o llamadas accidentales
@@ -201,17 +288,19 @@ def configurar_logging(
         manejador_consola = logging.StreamHandler(sys.stdout)
         manejador_consola.setLevel(nivel_consola)
         manejador_consola.setFormatter(formateador_log)
+        manejador_consola.addFilter(filtro_ubicacion)
         logger_raiz.addHandler(manejador_consola)
 
     # --- Manejador de Archivo ---
     _ruta_archivo_log_actual = None # Resetea ruta activa
     if log_a_archivo:
         try:
-            # 1. Obtener la ruta COMPLETA a la carpeta de logs (centralizado)
-            ruta_directorio_log = get_logs_path()
+            # 1. Obtener la ruta COMPLETA a la carpeta de logs (centralizado).
+            # Se calcula antes de crearla para poder informarla si makedirs falla.
+            ruta_directorio_log = os.fspath(_ruta_directorio_logs())
 
-            # 2. Asegurarse que la carpeta de logs EXISTA (fundamental)
-            os.makedirs(ruta_directorio_log, exist_ok=True)
+            # 2. Asegurarse que la carpeta de logs EXISTA (se crea una sola vez)
+            get_logs_path()
             # print(f"DEBUG (log_config): Directorio Logs asegurado en: {ruta_directorio_log}") # Descomentar para debug
 
             # 3. Construir la ruta COMPLETA al archivo de log
@@ -228,10 +317,18 @@ def configurar_logging(
             else:
                 manejador_archivo = logging.FileHandler(ruta_completa_archivo, encoding='utf-8')
 
-            # 5. Configurar y añadir el handler
+            # 5. Configurar el handler y conectarlo a través de una cola.
+            # El hilo que loguea solo hace queue.put; la escritura y la comprobación
+            # de rotación (stat/tell por registro) ocurren en el hilo del listener.
             manejador_archivo.setLevel(nivel_archivo)
             manejador_archivo.setFormatter(formateador_log)
-            logger_raiz.addHandler(manejador_archivo)
+            manejador_cola = QueueHandler(queue.Queue(-1))
+            manejador_cola.setLevel(nivel_archivo)
+            manejador_cola.addFilter(filtro_ubicacion) # En el hilo que loguea, antes de encolar
+            logger_raiz.addHandler(manejador_cola)
+            _listener_archivo = QueueListener(manejador_cola.queue, manejador_archivo, respect_handler_level=True)
+            _listener_archivo.start()
+            atexit.register(_detener_listener_archivo)
             _ruta_archivo_log_actual = ruta_completa_archivo # Guardar la ruta configurada con éxito
 
         except OSError as e_os:
@@ -249,14 +346,34 @@ def configurar_logging(
             logging.critical(f"Error inesperado configurando log archivo.", exc_info=True)
 
 
+    # --- Loggers con Handlers Directos ---
+    # Evita recorrer la jerarquía hasta el raíz en cada registro de estos loggers.
+    # Sin handlers activos no se toca nada, para que logging.lastResort siga
+    # mostrando los WARNING/ERROR como antes.
+    manejadores = logger_raiz.handlers[:]
+    if manejadores:
+        nivel_minimo = min(h.level for h in manejadores)
+        for nombre_logger in ("ConfigLog", *loggers_directos):
+            logger_directo = logging.getLogger(nombre_logger)
+            for handler in logger_directo.handlers[:]:
+                logger_directo.removeHandler(handler)
+            for handler in manejadores:
+                logger_directo.addHandler(handler)
+            logger_directo.setLevel(nivel_minimo)
+            logger_directo.propagate = False
+
     # --- Finalizar Configuración y Loguear Estado ---
     _configuracion_realizada = True
     logger_cfg_status = logging.getLogger("ConfigLog") # Logger para estado
 
-    # Loguear información útil sobre las rutas y estado del logging
-    logger_cfg_status.info(f"Sistema Logging Configurado ({'Empaquetado' if IS_BUNDLED else 'Desarrollo'}).")
-    logger_cfg_status.info(f"  Ruta Base Lectura (Código): {RUTA_BASE_LECTURA}")
-    logger_cfg_status.info(f"  Ruta Base Escritura (Logs/Datos/ExtConf): {RUTA_BASE_ESCRITURA}")
+    # Loguear información útil sobre las rutas y estado del logging.
+    # Si INFO está deshabilitado no se construye ninguno de los mensajes.
+    if not logger_cfg_status.isEnabledFor(logging.INFO):
+        return
+
+    logger_cfg_status.info("Sistema Logging Configurado (%s).", 'Empaquetado' if IS_BUNDLED else 'Desarrollo')
+    logger_cfg_status.info("  Ruta Base Lectura (Código): %s", _obtener_ruta_base_lectura())
+    logger_cfg_status.info("  Ruta Base Escritura (Logs/Datos/ExtConf): %s", _obtener_ruta_base_escritura())
 
     # Estado de los Handlers
     estado_consola = "OFF"
@@ -269,7 +386,20 @@ def configurar_logging(
         if usar_rotacion:
             estado_archivo += f" [Rot: {max_bytes_rotacion/(1024*1024):.1f}MB x{num_respaldos}]"
 
-    logger_cfg_status.info(f"  Estado Salidas -> Consola: {estado_consola} | Archivo: {estado_archivo}")
+    logger_cfg_status.info("  Estado Salidas -> Consola: %s | Archivo: %s", estado_consola, estado_archivo)
+
+def _detener_listener_archivo():
+    """
+    Detiene el QueueListener del log de archivo (vaciando la cola pendiente)
+    y cierra su handler. Se registra con atexit al configurar el logging.
+    """
+    global _listener_archivo
+    if _listener_archivo is None:
+        return
+    _listener_archivo.stop()
+    for handler in _listener_archivo.handlers:
+        handler.close()
+    _listener_archivo = None
 
 # ---------------------------------------------------------------------------
 # Función para Obtener la Ruta del Log Activo
@@ -23,21 +23,34 @@
 # =============================================================================
 
 # --- 1. IMPORTACIONES Y CONFIGURACIÓN DEL ENTORNO ---
-# Se importan las librerías estándar, las de terceros (Pandas, Selenium) y
-# los módulos propios del proyecto.
+# Se importan las librerías estándar y los módulos propios del proyecto.
+# Las librerías pesadas de terceros (Pandas, Selenium, Tkinter) se importan
+# dentro de las funciones que las usan, para no penalizar el arranque.
 
+import functools
 import json
 import os
 import sys
 import time
 import logging
-import platform
-import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timedelta
-import pandas as pd
 import csv
 
+# Parser JSON para las credenciales: orjson (extensión en C) si está instalado,
+# con la librería estándar como respaldo. Ambos reciben el archivo en bytes.
+# orjson.JSONDecodeError hereda de json.JSONDecodeError, así que el manejo de
+# errores es el mismo con cualquiera de los dos.
+try:
+    import orjson
+
+    def _json_loads(contenido: bytes):
+        return orjson.loads(contenido)
+except ImportError:
+    def _json_loads(contenido: bytes):
+        return json.loads(contenido.decode('utf-8'))
+
 # --- AJUSTE DE RUTA PARA IMPORTACIONES ROBUSTAS ---
 # Esta sección garantiza que los módulos propios (como 'config') se puedan
 # importar correctamente, sin importar desde dónde se ejecute el script.
@@ -46,6 +59,8 @@ project_root = os.path.abspath(os.path.join(script_dir, '..'))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+NOMBRE_LOGGER_PRINCIPAL = "RPA_Main_Flow"
+
 # --- IMPORTACIÓN Y CONFIGURACIÓN DEL MÓDULO DE LOGGING CENTRALIZADO ---
 # Se utiliza un módulo 'log_config' (una pieza clave de este framework) que maneja
 # las rutas de archivos de forma inteligente, distinguiendo entre entorno de
@@ -57,7 +72,8 @@ try:
     # la depuración de un proceso específico sin mezclarlo con otros.
     timestamp_log = datetime.now().strftime('%Y%m%d_%H%M%S')
     nombre_log_ejecucion = f"ejecucion_rpa_{timestamp_log}.log"
-    configurar_logging(nombre_archivo_log=nombre_log_ejecucion)
+    # El logger principal recibe los handlers directamente (sin propagar al raíz).
+    configurar_logging(nombre_archivo_log=nombre_log_ejecucion, loggers_directos=(NOMBRE_LOGGER_PRINCIPAL,))
 
 except ImportError:
     # Si 'log_config' falla, el script no se detiene. Provee un logging básico
@@ -65,41 +81,55 @@ except ImportError:
     print("ERROR CRÍTICO: No se pudo importar 'log_config'. Usando logging de emergencia.")
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-logger = logging.getLogger("RPA_Main_Flow")
-
-# --- Importaciones de GUI (Tkinter) y Web (Selenium) ---
-# Las importaciones se agrupan por funcionalidad para mayor claridad.
-import tkinter as tk
-from tkinter import simpledialog, messagebox
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.common.action_chains import ActionChains
+logger = logging.getLogger(NOMBRE_LOGGER_PRINCIPAL)
 
 # --- 2. CONSTANTES Y CONFIGURACIÓN DEL PROCESO ---
 # Almacenar URLs y selectores como constantes en la parte superior del script
 # mejora enormemente la mantenibilidad. Si la web cambia, solo hay que
 # actualizar esta sección.
+#
+# Los localizadores usan las cadenas de estrategia de Selenium ("id", "xpath",
+# "css selector"), equivalentes a By.ID, By.XPATH y By.CSS_SELECTOR, para no
+# tener que importar Selenium al cargar el módulo.
 
 URL_PRUEBA_LOGIN = "https://mi-aplicacion-web-de-prueba.com/login"
 DIR_DESCARGAS_TEMPORAL = "descargas_temp"
 NOMBRE_BASE_REPORTE_FINAL = "reporte_procesado"
 
+# --- Caché de nombres de columna normalizados (por conjunto de columnas) ---
+_CACHE_COLUMNAS: dict[tuple[str, ...], list[str]] = {}
+
+# --- Caché de la ruta de ChromeDriver ---
+# Evita que webdriver_manager consulte la red en cada ejecución.
+NOMBRE_CACHE_CHROMEDRIVER = ".chromedriver_cache.json"
+TTL_CACHE_CHROMEDRIVER_SEG = 24 * 60 * 60 # 24 horas
+
 # --- Selectores de la Página de Login ---
 ID_CAMPO_USUARIO = "username"
 ID_CAMPO_PASSWORD = "password"
 ID_CAMPO_EMPRESA = "companyId" # Ejemplo de un campo extra en el login
-SELECTOR_BOTON_LOGIN = (By.XPATH, "//button[contains(text(), 'Ingresar')]")
+SELECTOR_BOTON_LOGIN = ("xpath", "//button[contains(text(), 'Ingresar')]")
+
+# Rellena todos los campos y pulsa el botón en un solo viaje al navegador.
+# El valor se asigna con el setter nativo de HTMLInputElement (una asignación
+# directa a .value la ignora el seguimiento de valores de React) y luego se
+# disparan 'input'/'change' para que el framework registre el cambio.
+# arguments[0]: {id_campo: valor}, arguments[1]: elemento del botón de login.
+SCRIPT_LOGIN = """
+const asignarValor = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+for (const [id, valor] of Object.entries(arguments[0])) {
+    const campo = document.getElementById(id);
+    asignarValor.call(campo, valor);
+    campo.dispatchEvent(new Event('input', {bubbles: true}));
+    campo.dispatchEvent(new Event('change', {bubbles: true}));
+}
+arguments[1].click();
+"""
 
 # --- Selectores de la Página Principal (Post-Login) ---
-SELECTOR_ICONO_MENU = (By.CSS_SELECTOR, "i.fa-bars.menu-icon")
+SELECTOR_ICONO_MENU = ("css selector", "i.fa-bars.menu-icon")
 TEXTO_OPCION_MENU = "Reportes Avanzados"
-SELECTOR_FECHA_INICIO = (By.ID, "date-start")
+SELECTOR_FECHA_INICIO = ("id", "date-start")
 
 # --- Selectores del Módulo/Pop-up de Exportación ---
 XPATH_BOTON_EXPORTAR = "//div[@class='report-container']//button[@title='Exportar']"
@@ -111,16 +141,28 @@ XPATH_BOTON_CONFIRMAR_DESCARGA = "//div[@class='modal-dialog']//button[text()='C
 # El código se divide en funciones lógicas, cada una con una única
 # responsabilidad. Esto facilita las pruebas, la reutilización y la lectura.
 
+@functools.lru_cache(maxsize=4)
+def _leer_credenciales(ruta_absoluta: str) -> dict:
+    """
+    Lee y parsea el JSON de credenciales. Puede lanzar excepciones, que
+    no se cachean: solo los resultados válidos quedan memorizados.
+    """
+    logger.debug("Intentando cargar credenciales desde: %s", ruta_absoluta)
+    with open(ruta_absoluta, 'rb') as f:
+        return _json_loads(f.read())
+
+
 def cargar_credenciales(ruta_archivo: str) -> dict | None:
     """
     Carga de forma segura las credenciales desde un archivo JSON externo.
     Maneja errores comunes como archivo no encontrado o JSON mal formado.
     Separar las credenciales del código es una práctica de seguridad fundamental.
+    El archivo se lee una sola vez por ruta; las llamadas siguientes usan la caché.
     """
-    logger.debug(f"Intentando cargar credenciales desde: {ruta_archivo}")
+    from tkinter import messagebox
+
     try:
-        with open(ruta_archivo, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        credenciales = _leer_credenciales(os.path.abspath(ruta_archivo))
     except FileNotFoundError:
         logger.error(f"Archivo de credenciales no encontrado en la ruta especificada: {ruta_archivo}")
         messagebox.showerror("Error", f"No se encontró el archivo de credenciales:\n{ruta_archivo}")
@@ -130,6 +172,13 @@ def cargar_credenciales(ruta_archivo: str) -> dict | None:
         messagebox.showerror("Error", f"Archivo de credenciales con formato JSON inválido.")
         return None
 
+    if not isinstance(credenciales, dict):
+        logger.error(f"El archivo de credenciales no contiene un objeto JSON: {ruta_archivo}")
+        messagebox.showerror("Error", "El archivo de credenciales debe contener un objeto JSON.")
+        return None
+    # Se devuelve una copia para que el llamador no altere la caché
+    return dict(credenciales)
+
 
 def obtener_fecha_interactiva(fecha_sugerida: str) -> str | None:
     """
@@ -138,6 +187,9 @@ def obtener_fecha_interactiva(fecha_sugerida: str) -> str | None:
     una fecha sugerida o ingresar una manualmente. Esto es mucho más amigable
     que requerir la modificación de un archivo de configuración.
     """
+    import tkinter as tk
+    from tkinter import simpledialog
+
     logger.info("Mostrando diálogo de selección de fecha al usuario.")
     # El código interno de la GUI (original) es excelente para demostrarlo.
     # Aquí se mantiene la lógica, mostrando que la capacidad existe.
@@ -155,13 +207,24 @@ def realizar_login(driver, wait, creds: dict):
     Encapsula toda la lógica de login. Si el proceso de login cambia,
     solo se modifica esta función.
     """
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException
+
     logger.info("Iniciando proceso de login.")
     try:
         driver.get(URL_PRUEBA_LOGIN)
-        wait.until(EC.visibility_of_element_located((By.ID, ID_CAMPO_USUARIO))).send_keys(creds["correo"])
-        wait.until(EC.visibility_of_element_located((By.ID, ID_CAMPO_PASSWORD))).send_keys(creds["contraseña"])
-        wait.until(EC.visibility_of_element_located((By.ID, ID_CAMPO_EMPRESA))).send_keys(creds["empresa"])
-        wait.until(EC.element_to_be_clickable(SELECTOR_BOTON_LOGIN)).click()
+        # Una única espera: el botón de login es lo último del formulario, así
+        # que cuando es clicable los campos ya están presentes.
+        boton_login = wait.until(EC.element_to_be_clickable(SELECTOR_BOTON_LOGIN))
+        driver.execute_script(
+            SCRIPT_LOGIN,
+            {
+                ID_CAMPO_USUARIO: creds["correo"],
+                ID_CAMPO_PASSWORD: creds["contraseña"],
+                ID_CAMPO_EMPRESA: creds["empresa"],
+            },
+            boton_login,
+        )
         
         # Una buena práctica es esperar por un elemento de la página siguiente
         # para confirmar que el login fue exitoso.
@@ -176,35 +239,124 @@ def realizar_login(driver, wait, creds: dict):
         return False
 
 
+def obtener_ruta_chromedriver(ignorar_cache: bool = False) -> str:
+    """
+    Devuelve la ruta al ejecutable de ChromeDriver.
+    ChromeDriverManager().install() hace una petición HTTP en cada llamada, por
+    lo que la ruta resuelta se guarda en disco y se reutiliza mientras el archivo
+    exista y la caché no supere TTL_CACHE_CHROMEDRIVER_SEG.
+    Con ignorar_cache=True se descarta la caché (p. ej. si el driver guardado ya
+    no es compatible con el Chrome instalado) y se resuelve de nuevo.
+    """
+    ruta_cache = get_data_path(NOMBRE_CACHE_CHROMEDRIVER)
+    if ignorar_cache:
+        try:
+            os.remove(ruta_cache)
+        except OSError:
+            pass
+    else:
+        try:
+            with open(ruta_cache, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            ruta_driver = cache['path']
+            if time.time() - cache['ts'] < TTL_CACHE_CHROMEDRIVER_SEG and os.path.exists(ruta_driver):
+                logger.debug("Usando ChromeDriver en caché: %s", ruta_driver)
+                return ruta_driver
+        except (OSError, ValueError, KeyError, TypeError):
+            # Caché inexistente, corrupta o incompleta: se resuelve de nuevo
+            pass
+
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    ruta_driver = ChromeDriverManager().install()
+    try:
+        os.makedirs(os.path.dirname(ruta_cache), exist_ok=True)
+        with open(ruta_cache, 'w', encoding='utf-8') as f:
+            json.dump({'path': ruta_driver, 'ts': time.time()}, f)
+    except OSError as e:
+        # No poder guardar la caché no debe detener el proceso
+        logger.warning(f"No se pudo guardar la caché de ChromeDriver: {e}")
+    return ruta_driver
+
+
+def preparar_directorio_descargas(dir_descarga_temp: str) -> None:
+    """
+    Deja el directorio de descargas vacío y listo para usar, creándolo si no existe.
+    Se conserva el directorio y solo se borran los archivos que contiene, lo que
+    evita el recorrido completo de rmtree y la carrera rmtree/makedirs en Windows.
+    Lanza OSError si no se puede limpiar o crear.
+    """
+    if os.path.isdir(dir_descarga_temp):
+        with os.scandir(dir_descarga_temp) as entradas:
+            for entrada in entradas:
+                if entrada.is_file():
+                    os.unlink(entrada.path)
+        logger.info(f"Directorio temporal limpiado: {dir_descarga_temp}")
+    else:
+        os.makedirs(dir_descarga_temp)
+
+
+def normalizar_columnas(columnas) -> list[str]:
+    """
+    Estandariza nombres de columna (sin espacios en los extremos, minúsculas,
+    espacios internos como '_'). El resultado se memoriza por conjunto de
+    columnas, así en lotes de reportes con la misma cabecera se calcula una vez.
+    """
+    clave = tuple(columnas)
+    normalizadas = _CACHE_COLUMNAS.get(clave)
+    if normalizadas is None:
+        normalizadas = [col.strip().lower().replace(' ', '_') for col in clave]
+        _CACHE_COLUMNAS[clave] = normalizadas
+    return list(normalizadas)
+
+
 def procesar_reporte_con_pandas(ruta_csv_descargado: Path, ruta_dir_salida: Path, fecha_reporte: str) -> Path | None:
     """
     Encapsula la lógica de Transformación y Carga (parte del ETL).
     Esta función es un ejemplo de cómo manipular datos usando Pandas. La lógica
     interna puede ser tan compleja como se requiera.
     """
+    import numpy as np
+    import pandas as pd
+
     logger.info(f"Iniciando procesamiento de datos con Pandas para el archivo: {ruta_csv_descargado.name}")
     try:
-        # Cargar el archivo, intentando diferentes codificaciones si es necesario (robustez).
-        df = pd.read_csv(ruta_csv_descargado, delimiter=";", encoding='utf-8', on_bad_lines='skip')
-        logger.debug(f"Archivo cargado. {len(df)} filas y {len(df.columns)} columnas iniciales.")
+        # Cargar el archivo con el motor de PyArrow (lectura nativa y columnas
+        # respaldadas por Arrow). Si PyArrow no está instalado (ImportError) o la
+        # versión de Pandas no admite estas opciones (ValueError: on_bad_lines con
+        # PyArrow antes de Pandas 2.2; TypeError: dtype_backend antes de Pandas 2.0),
+        # se usa el motor C.
+        try:
+            df = pd.read_csv(ruta_csv_descargado, sep=";", encoding='utf-8', on_bad_lines='skip',
+                             engine='pyarrow', dtype_backend='pyarrow')
+        except (ImportError, ValueError, TypeError) as e:
+            logger.debug("Motor PyArrow no disponible (%s), usando el motor CSV por defecto de Pandas.", e)
+            df = pd.read_csv(ruta_csv_descargado, sep=";", encoding='utf-8', on_bad_lines='skip')
+        logger.debug("Archivo cargado. %d filas y %d columnas iniciales.", len(df), len(df.columns))
 
         # --- LÓGICA DE TRANSFORMACIÓN DE DATOS (EJEMPLO GENÉRICO) ---
 
         # 1. LIMPIEZA: Renombrar columnas para estandarizar (quitar espacios, acentos).
-        df.columns = df.columns.str.strip().str.lower().str.replace(' ', '_')
+        df.columns = normalizar_columnas(df.columns)
         
         # 2. ENRIQUECIMIENTO: Añadir nuevas columnas basadas en datos existentes.
-        df.insert(0, 'fecha_reporte', pd.to_datetime(fecha_reporte, format='%d/%m/%Y').strftime('%Y-%m-%d'))
+        # La fecha es constante: se formatea una vez y se guarda como categoría
+        # (un único valor + códigos int8) en lugar de una columna de objetos.
+        fecha_str = datetime.strptime(fecha_reporte, '%d/%m/%Y').strftime('%Y-%m-%d')
+        df.insert(0, 'fecha_reporte', pd.Categorical.from_codes(np.zeros(len(df), dtype='int8'), categories=[fecha_str]))
         
-        # 3. TRANSFORMACIÓN: Aplicar una función para crear una categoría.
+        # 3. TRANSFORMACIÓN: Crear una categoría con una operación vectorizada.
         if 'tipo_transaccion' in df.columns:
-            df['es_ingreso'] = df['tipo_transaccion'].apply(lambda x: True if 'venta' in str(x).lower() else False)
+            # astype('string') admite columnas vacías o numéricas, donde .str fallaría
+            df['es_ingreso'] = df['tipo_transaccion'].astype('string').str.contains('venta', case=False, regex=False, na=False)
 
         # 4. FILTRADO: Eliminar filas que no cumplen un criterio.
         if 'importe_neto' in df.columns:
-            df['importe_neto'] = pd.to_numeric(df['importe_neto'], errors='coerce')
-            df.dropna(subset=['importe_neto'], inplace=True) # Eliminar filas donde el importe no es un número
-            df = df[df['importe_neto'] > 0]
+            # Solo se convierte si la columna no llegó ya como numérica desde el lector
+            if not pd.api.types.is_numeric_dtype(df['importe_neto']):
+                df['importe_neto'] = pd.to_numeric(df['importe_neto'], errors='coerce')
+            # Eliminar filas donde el importe no es un número o no es positivo
+            df = df[df['importe_neto'].notna() & df['importe_neto'].gt(0)]
 
         # 5. SELECCIÓN: Quedarse solo con las columnas de interés en el orden deseado.
         columnas_finales = ['fecha_reporte', 'id_cliente', 'tipo_transaccion', 'importe_neto']
@@ -216,7 +368,22 @@ def procesar_reporte_con_pandas(ruta_csv_descargado: Path, ruta_dir_salida: Path
         # --- EXPORTACIÓN ---
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         ruta_salida_final = ruta_dir_salida / f"{NOMBRE_BASE_REPORTE_FINAL}_{timestamp}.csv"
-        df_final.to_csv(ruta_salida_final, index=False, sep=';', quoting=csv.QUOTE_ALL, encoding='utf-8-sig')
+        # Escritor CSV nativo y multihilo de PyArrow; si no está instalado, se usa Pandas.
+        # El BOM UTF-8 se escribe a mano para mantener la compatibilidad con Excel.
+        # quoting_style='needed' entrecomilla cabecera y textos pero no los números;
+        # el respaldo usa QUOTE_NONNUMERIC para producir exactamente el mismo formato.
+        # Ambos terminan las filas con os.linesep (CRLF en Windows), como to_csv por defecto.
+        try:
+            import pyarrow as pa
+            import pyarrow.csv as pa_csv
+        except ImportError:
+            df_final.to_csv(ruta_salida_final, index=False, sep=';', quoting=csv.QUOTE_NONNUMERIC, encoding='utf-8-sig')
+        else:
+            tabla = pa.Table.from_pandas(df_final, preserve_index=False)
+            opciones = pa_csv.WriteOptions(include_header=True, delimiter=';', quoting_style='needed', eol=os.linesep)
+            with open(ruta_salida_final, 'wb') as f:
+                f.write(b'\xef\xbb\xbf')
+                pa_csv.write_csv(tabla, f, write_options=opciones)
 
         logger.info(f"Reporte procesado guardado exitosamente en: {ruta_salida_final}")
         return ruta_salida_final
@@ -234,25 +401,38 @@ def ejecutar_flujo_rpa():
     Función principal que orquesta todo el proceso.
     Sigue una secuencia lógica y utiliza el manejo de errores en cada paso crítico.
     """
+    from tkinter import messagebox
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service as ChromeService
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.common.exceptions import SessionNotCreatedException
+
     logger.info("================ INICIO DEL FLUJO RPA ================")
     
     ruta_credenciales = get_credentials_path()
+    dir_descarga_temp = get_data_path(DIR_DESCARGAS_TEMPORAL)
+    dir_salida_final = get_data_path()
+
+    # --- Pre-Ejecución: E/S independientes en paralelo ---
+    # La lectura de credenciales, la resolución de ChromeDriver (red) y la
+    # limpieza de descargas no dependen entre sí, así que se solapan. Las
+    # credenciales se precargan en la caché de _leer_credenciales; los errores
+    # se reportan después desde el hilo principal (Tkinter no es thread-safe).
+    with ThreadPoolExecutor(max_workers=3) as ejecutor:
+        ejecutor.submit(_leer_credenciales, os.path.abspath(ruta_credenciales))
+        futuro_driver = ejecutor.submit(obtener_ruta_chromedriver)
+        futuro_directorio = ejecutor.submit(preparar_directorio_descargas, dir_descarga_temp)
+
     credenciales = cargar_credenciales(ruta_credenciales)
     if not credenciales:
         logger.critical("No se pudieron cargar las credenciales. Terminando proceso.")
         return # Salida temprana si falla un paso crítico
 
-    dir_descarga_temp = get_data_path(DIR_DESCARGAS_TEMPORAL)
-    dir_salida_final = get_data_path()
-
     # --- Pre-Ejecución: Limpieza de directorios ---
     # Es una buena práctica asegurar un estado limpio antes de cada ejecución,
     # especialmente en la carpeta de descargas para evitar usar archivos antiguos.
     try:
-        if os.path.exists(dir_descarga_temp):
-            shutil.rmtree(dir_descarga_temp)
-            logger.info(f"Directorio temporal limpiado: {dir_descarga_temp}")
-        os.makedirs(dir_descarga_temp)
+        futuro_directorio.result()
     except OSError as e:
         logger.error(f"No se pudo limpiar/crear el directorio de descargas: {e}")
         return
@@ -264,8 +444,14 @@ def ejecutar_flujo_rpa():
         logger.info("Inicializando WebDriver de Chrome...")
         chrome_options = webdriver.ChromeOptions()
         chrome_options.add_experimental_option("prefs", {"download.default_directory": dir_descarga_temp})
-        service = ChromeService(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
+        try:
+            driver = webdriver.Chrome(service=ChromeService(futuro_driver.result()), options=chrome_options)
+        except SessionNotCreatedException:
+            # Típico tras una actualización automática de Chrome: el driver en caché
+            # ya no coincide con el navegador. Se invalida la caché y se reintenta una vez.
+            logger.warning("ChromeDriver no compatible con el navegador instalado. Resolviendo de nuevo...")
+            service = ChromeService(obtener_ruta_chromedriver(ignorar_cache=True))
+            driver = webdriver.Chrome(service=service, options=chrome_options)
         wait = WebDriverWait(driver, 30) # Un wait global con un timeout generoso.
         driver.maximize_window()
 
@@ -288,10 +474,11 @@ def ejecutar_flujo_rpa():
         # Se simulará la creación de un archivo para continuar el flujo.
         
         ruta_csv_descargado_simulado = Path(dir_descarga_temp) / "reporte_bruto_simulado.csv"
-        pd.DataFrame({
-            'ID Cliente': [101, 102, 103], 'Tipo Transaccion': ['Venta', 'Devolucion', 'Venta'],
-            'Importe Neto': [200.50, -50.0, 120.75]
-        }).to_csv(ruta_csv_descargado_simulado, index=False, sep=';')
+        # Se escribe con el módulo csv estándar: Pandas no se carga hasta el procesamiento real.
+        with open(ruta_csv_descargado_simulado, 'w', newline='', encoding='utf-8') as f:
+            escritor = csv.writer(f, delimiter=';')
+            escritor.writerow(['ID Cliente', 'Tipo Transaccion', 'Importe Neto'])
+            escritor.writerows([(101, 'Venta', 200.50), (102, 'Devolucion', -50.0), (103, 'Venta', 120.75)])
         logger.info(f"Descarga simulada completada. Archivo: {ruta_csv_descargado_simulado}")
 
         # --- PASO 5: Procesamiento de Datos ---